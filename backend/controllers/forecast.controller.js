@@ -1,7 +1,7 @@
 /**
  * Forecast Controller — Node.js proxy to Python ML microservice
  *
- * The actual XGBRegressor (.pkl) runs in the Python Flask service
+ * The actual XGBoost model (.json) runs in the Python Flask service
  * on port 5050.  This controller simply forwards requests from the
  * authenticated frontend to that service.
  *
@@ -41,7 +41,7 @@ function stddev(arr) {
 
 /* ══════════════════════════════════════════════════════════════════════
    GET /api/ai/forecast
-   Proxied entirely from Python ML service (XGBoost pkl)
+   Proxied entirely from Python ML service (XGBoost model)
    ══════════════════════════════════════════════════════════════════════ */
 export const getForecast = async (req, res) => {
     try {
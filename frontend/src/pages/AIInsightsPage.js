@@ -515,7 +515,7 @@ function AIInsightsPage() {
                                 <div className="ai-offline-banner__title">XGBoost ML Service Offline</div>
                                 <div className="ai-offline-banner__desc">The Python service that runs the trained model is not running. Start it with:</div>
                                 <code className="ai-offline-banner__cmd">cd ml &amp;&amp; python serve_model.py</code>
-                                {!forecast && <div style={{ marginTop: 8, fontSize: 12, color: '#94a3b8' }}>Make sure you've run <code>python train_forecast_model.py</code> first to generate the .pkl file.</div>}
+                                {!forecast && <div style={{ marginTop: 8, fontSize: 12, color: '#94a3b8' }}>Make sure you've run <code>python train_forecast_model.py</code> first to generate forecast_model.json.</div>}
                             </div>
                         </div>
                     ) : (
@@ -664,7 +664,7 @@ function AIInsightsPage() {
                                         <FeatureBar key={i} feature={f.feature} importance={f.importance} />
                                     ))}
                                     <div className="ai-model-note">
-                                        <span>💡</span> Direct output from the XGBRegressor .pkl model — lag features (recent history) dominate prediction of next 15-min load.
+                                        <span>💡</span> Direct output from the XGBoost model — lag features (recent history) dominate prediction of next 15-min load.
                                     </div>
                                 </div>
                             </div>
@@ -0,0 +1,47 @@
+"""
+Gunicorn config for the Smart Grid ML Microservice
+===================================================
+Run (from ml/):  gunicorn -c gunicorn_conf.py serve_model:app
+Port: 5050
+
+The app is preloaded in the master so the model, df_test and y_pred_all are
+built once and shared copy-on-write with every worker.
+"""
+
+import os
+import gc
+import ctypes
+
+# ─── Server ──────────────────────────────────────────────────────────────────
+bind         = "0.0.0.0:5050"
+chdir        = os.path.dirname(os.path.abspath(__file__))
+preload_app  = True
+workers      = max(2, (os.cpu_count() or 1) // 2)
+worker_class = "gthread"
+threads      = 4
+
+OMP_PAUSE_SOFT = 1
+
+# N workers × all-core OpenMP pools would oversubscribe the box. OpenMP reads
+# this once when XGBoost is first loaded — with preload_app that is in the
+# master, before any fork — so it has to be set here, not in a worker hook.
+# An explicit OMP_NUM_THREADS in the environment still wins.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+
+# ─── Hooks ───────────────────────────────────────────────────────────────────
+def pre_fork(server, worker):
+    """
+    XGBoost ≥ 1.6 leaves an OpenMP thread pool alive after predict(); forking
+    with it running deadlocks the children. Pause the pool in the master first.
+
+    Also freeze the preloaded objects out of the cyclic GC: a collection in a
+    worker would otherwise write to every object header and un-share the pages.
+    """
+    gc.freeze()
+    try:
+        import xgboost
+        lib = ctypes.CDLL(xgboost.core._LIB._name)
+        lib.omp_pause_resource_all(ctypes.c_int(OMP_PAUSE_SOFT))
+    except (ImportError, OSError, AttributeError) as e:
+        server.log.warning(f"Could not pause OpenMP resources: {e}")
@@ -1,8 +1,9 @@
 """
 Smart Grid ML Microservice
 ===========================
-Loads the trained XGBRegressor (.pkl) and serves predictions via HTTP.
-Run:  python serve_model.py
+Loads the trained XGBoost Booster (.json) and serves predictions via HTTP.
+Run:  gunicorn -c gunicorn_conf.py serve_model:app   (production)
+      python serve_model.py                         (dev server)
 Port: 5050
 
 Endpoints:
@@ -14,22 +15,30 @@ Endpoints:
 
 import os
 import sys
-import json
 import math
+import hashlib
 import traceback
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
-import joblib
-from flask import Flask, jsonify, request
+import orjson
+import xgboost as xgb
+try:
+    import tl2cgen
+except ImportError:     # optional — compiled fast path
+    tl2cgen = None
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 # ─── Paths ───────────────────────────────────────────────────────────────────
 BASE_DIR     = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH   = os.path.join(BASE_DIR, "forecast_model.pkl")
+MODEL_PATH   = os.path.join(BASE_DIR, "forecast_model.json")
+COMPILED_MODEL_PATH = os.path.join(BASE_DIR, "forecast_model.so")  # Treelite, optional
 DATASET_PATH = os.path.join(BASE_DIR, "..", "smart_grid_dataset.csv")
+PARQUET_PATH = DATASET_PATH.replace(".csv", ".parquet")   # written by training
 
 # ─── Load model & dataset once at startup ────────────────────────────────────
 print("🔄 Loading model …", flush=True)
@@ -38,13 +47,38 @@ if not os.path.exists(MODEL_PATH):
     print("   Run  python train_forecast_model.py  first.")
     sys.exit(1)
 
-model = joblib.load(MODEL_PATH)
+booster = xgb.Booster()
+booster.load_model(MODEL_PATH)
 print(f"✅ Model loaded: {MODEL_PATH}", flush=True)
 
+# Treelite-compiled copy of the same trees — only if built from the current model
+predictor = None
+if (tl2cgen is not None and os.path.exists(COMPILED_MODEL_PATH)
+        and os.path.exists(MODEL_PATH)
+        and os.path.getmtime(COMPILED_MODEL_PATH) >= os.path.getmtime(MODEL_PATH)):
+    try:
+        predictor = tl2cgen.Predictor(COMPILED_MODEL_PATH)
+        print(f"✅ Compiled model loaded: {COMPILED_MODEL_PATH}", flush=True)
+    except (OSError, tl2cgen.TL2cgenError) as e:
+        # e.g. built on another host/arch — score with XGBoost instead
+        print(f"⚠️  Compiled model not usable ({e}); falling back to XGBoost", flush=True)
+
+
+def predict(X):
+    """Score a float32 feature matrix — compiled library if loaded, else XGBoost."""
+    if predictor is not None:
+        return predictor.predict(tl2cgen.DMatrix(X)).reshape(-1)
+    return booster.inplace_predict(X)   # raw array, no DMatrix copy
+
 print("📂 Loading dataset …", flush=True)
-df_raw = pd.read_csv(DATASET_PATH)
-df_raw["Timestamp"] = pd.to_datetime(df_raw["Timestamp"])
-df_raw = df_raw.sort_values("Timestamp").reset_index(drop=True)
+if (os.path.exists(PARQUET_PATH)
+        and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(DATASET_PATH)):
+    # Already typed (Timestamp is datetime64) and sorted by training
+    df_raw = pd.read_parquet(PARQUET_PATH)
+else:
+    df_raw = pd.read_csv(DATASET_PATH)
+    df_raw["Timestamp"] = pd.to_datetime(df_raw["Timestamp"])
+    df_raw = df_raw.sort_values("Timestamp").reset_index(drop=True)
 
 # Replicate the same feature engineering as training
 df_raw["hour"]       = df_raw["Timestamp"].dt.hour
@@ -60,6 +94,18 @@ df_raw["power_roll_std_1h"]  = df_raw["Power Consumption (kW)"].rolling(4).std()
 df_raw["power_roll_max_1h"]  = df_raw["Power Consumption (kW)"].rolling(4).max()
 df_raw.dropna(inplace=True)
 
+# Downcast: calendar columns fit in int8, and XGBoost scores in float32
+# anyway — halves the bytes every later aggregation has to stream
+INT8_COLS    = ["hour", "dayofweek", "month", "is_weekend"]
+FLOAT32_COLS = [
+    "power_lag_1", "power_lag_2", "power_lag_4",
+    "power_roll_mean_1h", "power_roll_std_1h", "power_roll_max_1h",
+    "Power Consumption (kW)", "Voltage (V)", "Current (A)",
+    "Reactive Power (kVAR)", "Power Factor",
+]
+df_raw[INT8_COLS]    = df_raw[INT8_COLS].astype(np.int8)
+df_raw[FLOAT32_COLS] = df_raw[FLOAT32_COLS].astype(np.float32)
+
 FEATURES = [
     "Voltage (V)", "Current (A)", "Reactive Power (kVAR)", "Power Factor",
     "hour", "dayofweek", "month", "is_weekend",
@@ -69,17 +115,21 @@ FEATURES = [
 TARGET = "Power Consumption (kW)"
 
 # 80/20 time-based split (must match training exactly)
-split_idx = int(len(df_raw) * 0.8)
-df_train = df_raw.iloc[:split_idx]
-df_test  = df_raw.iloc[split_idx:].copy()
+split_idx  = int(len(df_raw) * 0.8)
+TRAIN_SIZE = split_idx
+df_test    = df_raw.iloc[split_idx:].copy()
 
-X_test = df_test[FEATURES]
+# Only the test split is served — release the full frame (~5× df_test) now so
+# it never ends up in the pages gunicorn workers inherit
+del df_raw
+
+# Feature matrix as one C-contiguous float32 block (XGBoost scores in fp32
+# anyway). Kept as a module global for anything that needs to re-score.
+X_TEST_ARR = np.ascontiguousarray(df_test[FEATURES].to_numpy(), dtype=np.float32)
 y_test = df_test[TARGET]
 
 # Run model predictions on the full test set (done ONCE at startup)
-y_pred_all = model.predict(X_test)
-df_test = df_test.copy()
-df_test["predicted_kw"] = y_pred_all
+y_pred_all = predict(X_TEST_ARR)
 
 MAE_VAL  = float(mean_absolute_error(y_test, y_pred_all))
 RMSE_VAL = float(math.sqrt(mean_squared_error(y_test, y_pred_all)))
@@ -87,33 +137,128 @@ R2_VAL   = float(max(0.0, r2_score(y_test, y_pred_all)))
 
 print(f"✅ Model evaluated — MAE={MAE_VAL:.4f} RMSE={RMSE_VAL:.4f} R²={R2_VAL:.4f}", flush=True)
 
-# Feature importance
+# Feature importance (gain, normalised — same as XGBRegressor.feature_importances_)
+gain       = booster.get_score(importance_type="gain")
+gain_total = sum(gain.values()) or 1.0
 feat_imp = [
     {"feature": feat, "importance": float(imp)}
     for feat, imp in sorted(
-        zip(FEATURES, model.feature_importances_),
+        ((f, gain.get(f, 0.0) / gain_total) for f in FEATURES),
         key=lambda x: x[1], reverse=True
     )
 ]
 
-# ─── Flask app ────────────────────────────────────────────────────────────────
-app = Flask(__name__)
-CORS(app)   # allow Node.js to call us
+# ─── Frozen test-set arrays ──────────────────────────────────────────────────
+# Every aggregation below reads these read-only, time-sorted arrays; the
+# DataFrame is only a startup artifact and is released once they exist.
+T_TIMESTAMPS = df_test["Timestamp"].to_numpy()
+T_POWER      = df_test["Power Consumption (kW)"].to_numpy(np.float32)
+T_PRED       = np.asarray(y_pred_all, dtype=np.float32)
+T_HOUR       = df_test["hour"].to_numpy(np.intp)
+T_DOW        = df_test["dayofweek"].to_numpy(np.intp)
+T_VOLTAGE    = df_test["Voltage (V)"].to_numpy(np.float32)
+T_CURRENT    = df_test["Current (A)"].to_numpy(np.float32)
+T_PF         = df_test["Power Factor"].to_numpy(np.float32)
+TEST_SIZE    = len(df_test)
+for _arr in (T_TIMESTAMPS, T_POWER, T_PRED, T_HOUR, T_DOW, T_VOLTAGE, T_CURRENT, T_PF):
+    _arr.flags.writeable = False
+del df_test, y_test
+
+
+def group_stats(keys, values, n):
+    """
+    Per-key (max, mean, median) of `values` for integer keys 0..n-1, NaN for
+    empty keys. One lexsort, then searchsorted bounds + reduceat per group.
+    """
+    order  = np.lexsort((values, keys))         # by key, then value within key
+    k      = keys[order]
+    v      = values[order].astype(np.float64)
+    bounds = np.searchsorted(k, np.arange(n + 1))
+    starts, counts = bounds[:-1], np.diff(bounds)
+    ok     = counts > 0
+
+    g_max, g_mean, g_median = (np.full(n, np.nan) for _ in range(3))
+    s, c = starts[ok], counts[ok]
+    g_max[ok]    = v[s + c - 1]                 # values are sorted in each group
+    g_mean[ok]   = np.add.reduceat(v, s) / c
+    g_median[ok] = (v[s + (c - 1) // 2] + v[s + c // 2]) / 2
+    return g_max, g_mean, g_median
+
+
+def round4(values):
+    """Round a whole column to 4 dp in one NumPy pass; NaN → None."""
+    arr = np.round(np.asarray(values, dtype=np.float64), 4)
+    return np.where(np.isnan(arr), None, arr).tolist()
+
+# ─── Payload builders (run once at startup) ──────────────────────────────────
+# The test-set arrays never change after import, so neither do the
+# /forecast and /peak bodies — build them here instead of on every request.
+DAY_LABELS  = ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"]
+HOUR_LABELS = [f"{h:02d}:00" for h in range(24)]
+HIST_BINS   = np.array([0, 2, 4, 6, 8, 10, 12, np.inf], dtype=np.float32)
+HIST_LABELS = ["0-2 kW","2-4 kW","4-6 kW","6-8 kW","8-10 kW","10-12 kW","12+ kW"]
+
+def _build_forecast24h():
+    """Today: last 96 rows of test set (24h × 4 intervals/h), by hour."""
+    hours     = T_HOUR[-96:]
+    actual    = T_POWER[-96:]
+    predicted = T_PRED[-96:]
+
+    # Aggregate to hourly (mean actual, mean predicted)
+    slot_hours = hours.reshape(24, 4) if hours.size == 96 else None
+    if (slot_hours is not None and (slot_hours == slot_hours[:, :1]).all()
+            and np.unique(slot_hours[:, 0]).size == 24):
+        # 24 whole hours × 4 intervals (any start hour): a (24, 4) reshape,
+        # then scatter each row's mean to its hour-of-day slot
+        hourly_actual    = np.empty(24)
+        hourly_predicted = np.empty(24)
+        hourly_actual[slot_hours[:, 0]]    = actual.reshape(24, 4).mean(axis=1)
+        hourly_predicted[slot_hours[:, 0]] = predicted.reshape(24, 4).mean(axis=1)
+    else:
+        # Gaps or an offset window — mean by hour label, NaN where missing
+        counts = np.bincount(hours, minlength=24).astype(np.float64)
+        counts[counts == 0] = np.nan
+        hourly_actual    = np.bincount(hours, weights=actual,    minlength=24) / counts
+        hourly_predicted = np.bincount(hours, weights=predicted, minlength=24) / counts
+
+    return [
+        {"hour": h, "label": label, "actual": act, "predicted": pred}
+        for h, label, act, pred in zip(
+            range(24), HOUR_LABELS, round4(hourly_actual), round4(hourly_predicted)
+        )
+    ]
 
-def safe_float(val):
-    """Convert numpy/pandas values to JSON-serialisable Python float."""
-    if val is None or (isinstance(val, float) and math.isnan(val)):
-        return None
-    return round(float(val), 4)
 
-# ─── /health ─────────────────────────────────────────────────────────────────
-@app.route("/health")
-def health():
-    return jsonify({"status": "ok", "model": "XGBRegressor", "testRows": len(df_test)})
+# ─── Day-of-week lookup tables ───────────────────────────────────────────────
+# HOURLY_MEDIAN[dow, hour] — median predicted kW; PEAK/AVG_BY_DOW[dow] — daily
+HOURLY_MEDIAN      = group_stats(T_DOW * 24 + T_HOUR, T_PRED, 7 * 24)[2].reshape(7, 24)
+_HOURLY_MEDIAN_ALL = group_stats(T_HOUR, T_PRED, 24)[2]
 
-# ─── /forecast ───────────────────────────────────────────────────────────────
-@app.route("/forecast")
-def forecast():
+_dow_max, _dow_mean, _ = group_stats(T_DOW, T_PRED, 7)
+PEAK_BY_DOW = round4(np.nan_to_num(_dow_max,  nan=0.0))
+AVG_BY_DOW  = round4(np.nan_to_num(_dow_mean, nan=0.0))
+
+
+def _build_forecast_tomorrow(tomorrow_dow):
+    """Next 24 hours predicted (median of matching hour/dow in test set)."""
+    preds = HOURLY_MEDIAN[tomorrow_dow]
+    if np.isnan(preds).all():
+        preds = _HOURLY_MEDIAN_ALL  # fallback: no rows for that day-of-week
+
+    CONFIDENCE_BASE = 88  # slightly lower for tomorrow
+    return [
+        {"hour": h, "label": label, "predicted": pred, "confidence": CONFIDENCE_BASE + (h % 4)}
+        for h, label, pred in zip(
+            range(24), HOUR_LABELS, round4(np.nan_to_num(preds, nan=0.0))
+        )
+    ]
+
+
+FORECAST_24H             = _build_forecast24h()
+FORECAST_TOMORROW_BY_DOW = {dow: _build_forecast_tomorrow(dow) for dow in range(7)}
+
+
+def _build_forecast_payload(today):
     """
     Returns:
       forecast24h    — today's (last 24h from test data), actual vs predicted, by hour
@@ -122,106 +267,55 @@ def forecast():
       featureImportance
       weeklyForecast — next 7 days peak predicted from model
     """
-    try:
-        # ── Today: last 96 rows of test set (24h × 4 intervals/h) ────────────
-        recent_96 = df_test.tail(96).copy()
-
-        # Aggregate to hourly (mean actual, mean predicted)
-        recent_96["hour_slot"] = recent_96["hour"]
-        hourly = (
-            recent_96.groupby("hour_slot")
-            .agg(actual=("Power Consumption (kW)", "mean"),
-                 predicted=("predicted_kw", "mean"))
-            .reindex(range(24))
-        )
-
-        forecast24h = []
-        for h in range(24):
-            row = hourly.loc[h] if h in hourly.index else None
-            forecast24h.append({
-                "hour": h,
-                "label": f"{h:02d}:00",
-                "actual":    safe_float(row["actual"])    if row is not None else None,
-                "predicted": safe_float(row["predicted"]) if row is not None else None,
-            })
-
-        # ── Tomorrow: pick same day-of-week from test set, predict by hour ───
-        tomorrow_dow = (datetime.now().weekday() + 1) % 7   # 0=Mon…6=Sun
-
-        # filter test rows matching that day-of-week
-        dow_rows = df_test[df_test["dayofweek"] == tomorrow_dow]
-        if dow_rows.empty:
-            dow_rows = df_test  # fallback
-
-        dow_hourly = (
-            dow_rows.groupby("hour")
-            .agg(predicted=("predicted_kw", "median"))
-            .reindex(range(24))
-        )
-
-        CONFIDENCE_BASE = 88  # slightly lower for tomorrow
-        forecastTomorrow = []
-        for h in range(24):
-            pred = dow_hourly.loc[h, "predicted"] if h in dow_hourly.index else None
-            forecastTomorrow.append({
-                "hour": h,
-                "label": f"{h:02d}:00",
-                "predicted": safe_float(pred) if pred is not None and not math.isnan(float(pred)) else 0,
-                "confidence": CONFIDENCE_BASE + (h % 4),
-            })
-
-        # ── 7-day peak forecast using the model ──────────────────────────────
-        # For each future day (next 7), get the predicted peak hour from the
-        # corresponding day-of-week in the test set
-        weeklyForecast = []
-        for i in range(1, 8):
-            day = datetime.now() + timedelta(days=i)
-            dow  = day.weekday()
-            is_weekend = dow >= 5
-            label = ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"][dow]
-
-            day_rows = df_test[df_test["dayofweek"] == dow]
-            if day_rows.empty:
-                peak_pred = 0.0
-                avg_pred  = 0.0
-            else:
-                peak_pred = float(day_rows["predicted_kw"].max())
-                avg_pred  = float(day_rows["predicted_kw"].mean())
-
-            weeklyForecast.append({
-                "date":          day.strftime("%Y-%m-%d"),
-                "dayLabel":      label,
-                "peakPredicted": safe_float(peak_pred),
-                "avgPredicted":  safe_float(avg_pred),
-                "isWeekend":     is_weekend,
-            })
-
-        return jsonify({
-            "forecast24h":      forecast24h,
-            "forecastTomorrow": forecastTomorrow,
-            "modelStats": {
-                "mae":       round(MAE_VAL, 4),
-                "rmse":      round(RMSE_VAL, 4),
-                "r2":        round(R2_VAL, 4),
-                "trainSize": len(df_train),
-                "testSize":  len(df_test),
-                "algorithm": "Gradient Boosted Regression (XGBoost)",
-                "features":  len(FEATURES),
-                "nEstimators":    300,
-                "learningRate":   0.05,
-            },
-            "featureImportance": feat_imp,
-            "weeklyForecast":    weeklyForecast,
+    tomorrow_dow = (today.weekday() + 1) % 7   # 0=Mon…6=Sun
+
+    # ── 7-day peak forecast using the model ──────────────────────────────────
+    # For each future day (next 7), get the predicted peak hour from the
+    # corresponding day-of-week in the test set
+    weeklyForecast = []
+    for i in range(1, 8):
+        day = today + timedelta(days=i)
+        dow = day.weekday()
+        weeklyForecast.append({
+            "date":          day.strftime("%Y-%m-%d"),
+            "dayLabel":      DAY_LABELS[dow],
+            "peakPredicted": PEAK_BY_DOW[dow],
+            "avgPredicted":  AVG_BY_DOW[dow],
+            "isWeekend":     dow >= 5,
         })
 
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
-
-
-# ─── /peak ───────────────────────────────────────────────────────────────────
-@app.route("/peak")
-def peak():
+    return {
+        "forecast24h":      FORECAST_24H,
+        "forecastTomorrow": FORECAST_TOMORROW_BY_DOW[tomorrow_dow],
+        "modelStats": {
+            "mae":       round(MAE_VAL, 4),
+            "rmse":      round(RMSE_VAL, 4),
+            "r2":        round(R2_VAL, 4),
+            "trainSize": TRAIN_SIZE,
+            "testSize":  TEST_SIZE,
+            "algorithm": "Gradient Boosted Regression (XGBoost)",
+            "features":  len(FEATURES),
+            "nEstimators":    300,
+            "learningRate":   0.05,
+        },
+        "featureImportance": feat_imp,
+        "weeklyForecast":    weeklyForecast,
+    }
+
+
+# Per-day actual/predicted peak and mean, computed once — /peak slices it.
+# Timestamps are sorted, so each calendar day is one contiguous run.
+_days       = T_TIMESTAMPS.astype("datetime64[D]")
+DAILY_DATES = np.unique(_days)
+_day_starts = np.searchsorted(_days, DAILY_DATES)
+_day_counts = np.diff(np.append(_day_starts, _days.size))
+DAILY_PEAK_KW      = np.maximum.reduceat(T_POWER, _day_starts)
+DAILY_PEAK_PRED_KW = np.maximum.reduceat(T_PRED,  _day_starts)
+DAILY_AVG_KW       = np.add.reduceat(T_POWER.astype(np.float64), _day_starts) / _day_counts
+DAILY_AVG_PRED_KW  = np.add.reduceat(T_PRED.astype(np.float64),  _day_starts) / _day_counts
+
+
+def _build_peak_payload():
     """
     Daily peak load analysis — uses test-set predictions from the model.
     Returns:
@@ -230,85 +324,138 @@ def peak():
       histogram     — power bucket distribution (model predicted)
       top10         — top 10 peak predicted intervals
     """
-    try:
-        df_work = df_test.copy()
-        df_work["date"] = df_work["Timestamp"].dt.date
-
-        # Daily aggregation using MODEL predictions
-        daily = (
-            df_work.groupby("date")
-            .agg(
-                peakKW=    ("Power Consumption (kW)", "max"),
-                peakPredKW=("predicted_kw", "max"),
-                avgKW=     ("Power Consumption (kW)", "mean"),
-                avgPredKW= ("predicted_kw", "mean"),
-            )
-            .reset_index()
-            .sort_values("date")
+    # Last 30 days
+    last_30 = slice(-30, None)
+
+    # Clean whole columns at once, then zip them into rows
+    daily_peak_list = [
+        {
+            "date":        d,
+            "peakKW":      peak,
+            "peakPredKW":  peak_pred,
+            "avgKW":       avg,
+            "avgPredKW":   avg_pred,
+        }
+        for d, peak, peak_pred, avg, avg_pred in zip(
+            np.datetime_as_string(DAILY_DATES[last_30], unit="D").tolist(),
+            round4(DAILY_PEAK_KW[last_30]),
+            round4(DAILY_PEAK_PRED_KW[last_30]),
+            round4(DAILY_AVG_KW[last_30]),
+            round4(DAILY_AVG_PRED_KW[last_30]),
         )
-
-        # Last 30 days
-        daily_30 = daily.tail(30)
-
-        daily_peak_list = [
-            {
-                "date":        str(row["date"]),
-                "peakKW":      safe_float(row["peakKW"]),
-                "peakPredKW":  safe_float(row["peakPredKW"]),
-                "avgKW":       safe_float(row["avgKW"]),
-                "avgPredKW":   safe_float(row["avgPredKW"]),
-            }
-            for _, row in daily_30.iterrows()
-        ]
-
-        # Overall stats from model predictions
-        pred_vals = df_work["predicted_kw"]
-        stats = {
-            "maxPredKW": safe_float(pred_vals.max()),
-            "avgPredKW": safe_float(pred_vals.mean()),
-            "minPredKW": safe_float(pred_vals.min()),
-            "maxActKW":  safe_float(df_work["Power Consumption (kW)"].max()),
-            "avgActKW":  safe_float(df_work["Power Consumption (kW)"].mean()),
+    ]
+
+    # Overall stats from model predictions
+    stats = dict(zip(
+        ["maxPredKW", "avgPredKW", "minPredKW", "maxActKW", "avgActKW"],
+        round4([
+            T_PRED.max(), T_PRED.mean(dtype=np.float64), T_PRED.min(),
+            T_POWER.max(), T_POWER.mean(dtype=np.float64),
+        ]),
+    ))
+
+    # Histogram of predicted power (buckets 0-2, 2-4, 4-6, 6-8, 8-10, 10-12, 12+)
+    hist_counts, _ = np.histogram(T_PRED, bins=HIST_BINS)
+    histogram = [
+        {"range": lbl, "count": cnt}
+        for lbl, cnt in zip(HIST_LABELS, hist_counts)
+    ]
+
+    # Top 10 predicted peak intervals
+    # argpartition is O(N); only the 10 winners are then sorted (descending)
+    k   = min(10, T_PRED.size)
+    idx = np.argpartition(T_PRED, -k)[-k:]
+    idx = idx[np.argsort(-T_PRED[idx], kind="stable")]
+    times = np.char.replace(np.datetime_as_string(T_TIMESTAMPS[idx], unit="m"), "T", " ")
+    top10 = [
+        {
+            "time":        t,
+            "actualKW":    act,
+            "predictedKW": pred,
+            "voltage":     volt,
+            "current":     cur,
+            "powerFactor": pf,
         }
+        for t, act, pred, volt, cur, pf in zip(
+            times.tolist(),
+            round4(T_POWER[idx]),
+            round4(T_PRED[idx]),
+            round4(T_VOLTAGE[idx]),
+            round4(T_CURRENT[idx]),
+            round4(T_PF[idx]),
+        )
+    ]
+
+    return {
+        "dailyPeak":  daily_peak_list,
+        "stats":      stats,
+        "histogram":  histogram,
+        "top10":      top10,
+    }
 
-        # Histogram of predicted power (buckets 0-2, 2-4, 4-6, 6-8, 8-10, 10-12, 12+)
-        bins   = [0, 2, 4, 6, 8, 10, 12, float("inf")]
-        labels = ["0-2 kW","2-4 kW","4-6 kW","6-8 kW","8-10 kW","10-12 kW","12+ kW"]
-        pred_series = pd.cut(df_work["predicted_kw"], bins=bins, labels=labels)
-        hist_counts = pred_series.value_counts().reindex(labels, fill_value=0)
-        histogram = [
-            {"range": lbl, "count": int(cnt)}
-            for lbl, cnt in hist_counts.items()
-        ]
-
-        # Top 10 predicted peak intervals
-        top10_df = df_work.nlargest(10, "predicted_kw")[
-            ["Timestamp","Power Consumption (kW)","predicted_kw","Voltage (V)","Current (A)","Power Factor"]
-        ]
-        top10 = [
-            {
-                "time":        row["Timestamp"].strftime("%Y-%m-%d %H:%M"),
-                "actualKW":    safe_float(row["Power Consumption (kW)"]),
-                "predictedKW": safe_float(row["predicted_kw"]),
-                "voltage":     safe_float(row["Voltage (V)"]),
-                "current":     safe_float(row["Current (A)"]),
-                "powerFactor": safe_float(row["Power Factor"]),
-            }
-            for _, row in top10_df.iterrows()
-        ]
-
-        return jsonify({
-            "dailyPeak":  daily_peak_list,
-            "stats":      stats,
-            "histogram":  histogram,
-            "top10":      top10,
-        })
+
+def to_json(payload):
+    """orjson with native numpy support — no per-value float()/int() boxing."""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def content_etag(body):
+    """Short content hash of a serialised payload, used as its ETag."""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _forecast_json(today):
+    """(body, etag) for /forecast — only the weekly dates change, once a day."""
+    body = to_json(_build_forecast_payload(today))
+    return body, content_etag(body)
+
+
+PEAK_JSON = to_json(_build_peak_payload())
+PEAK_ETAG = content_etag(PEAK_JSON)
+_forecast_json(date.today())   # warm the cache before workers fork
+print("✅ Responses precomputed", flush=True)
+
+# ─── Flask app ────────────────────────────────────────────────────────────────
+app = Flask(__name__)
+CORS(app)   # allow Node.js to call us
+
+CACHE_CONTROL = "public, max-age=60, immutable"
+
+def cached_json_response(body, etag):
+    """Serve a precomputed body with caching headers; 304 if the client has it."""
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = CACHE_CONTROL
+    return resp
+
+# ─── /health ─────────────────────────────────────────────────────────────────
+@app.route("/health")
+def health():
+    return jsonify({"status": "ok", "model": "XGBRegressor", "testRows": TEST_SIZE})
+
+# ─── /forecast ───────────────────────────────────────────────────────────────
+@app.route("/forecast")
+def forecast():
+    """Precomputed forecast payload (see _build_forecast_payload)."""
+    try:
+        return cached_json_response(*_forecast_json(date.today()))
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 
+# ─── /peak ───────────────────────────────────────────────────────────────────
+@app.route("/peak")
+def peak():
+    """Precomputed daily peak payload (see _build_peak_payload)."""
+    return cached_json_response(PEAK_JSON, PEAK_ETAG)
+
+
 # ─── Run ─────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     print("🚀 Flask ML service starting on http://localhost:5050", flush=True)
@@ -1,32 +1,52 @@
 # ============================================================
 # SMART GRID LOAD FORECASTING + EFFICIENCY ANALYSIS
 # Dataset : smart_grid_dataset.csv  (50,001 rows × 16 cols)
-# Output  : ml/forecast_model.pkl  (XGBRegressor)
+# Output  : ml/forecast_model.json (XGBoost native Booster)
+#           ml/forecast_model.so   (Treelite-compiled — optional)
 #           ml/scaler.pkl           (StandardScaler  — optional)
-#           ml/plots/               (4 PNG files)
+#           ml/plots/               (4 PNG files — with --plots)
 # ============================================================
 # Install deps (once):
-#   pip install xgboost scikit-learn pandas numpy matplotlib joblib
+#   pip install xgboost scikit-learn pandas numpy
+#   pip install matplotlib          (only for --plots)
+#   pip install pyarrow             (optional — Parquet copy for serving)
+#   pip install numba               (optional — fused rolling kernel)
+#   pip install treelite tl2cgen    (optional — compiled model, needs gcc)
 # ============================================================
 
 import os
+import math
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")           # headless — saves to file, no GUI needed
-import matplotlib.pyplot as plt
-import joblib
 
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from xgboost import XGBRegressor
 
+try:
+    import numba
+except ImportError:             # optional — NumPy fallback below
+    numba = None
+
+try:
+    import treelite
+    import tl2cgen
+except ImportError:             # optional — no compiled model
+    treelite = None
+
 # ─── Paths ──────────────────────────────────────────────────
 SCRIPT_DIR  = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(SCRIPT_DIR, "..", "smart_grid_dataset.csv")
-MODEL_PATH  = os.path.join(SCRIPT_DIR, "forecast_model.pkl")
+PARQUET_PATH = DATASET_PATH.replace(".csv", ".parquet")
+MODEL_PATH  = os.path.join(SCRIPT_DIR, "forecast_model.json")
+COMPILED_MODEL_PATH = os.path.join(SCRIPT_DIR, "forecast_model.so")
 PLOTS_DIR   = os.path.join(SCRIPT_DIR, "plots")
-os.makedirs(PLOTS_DIR, exist_ok=True)
+
+parser = argparse.ArgumentParser(description="Train the smart grid load forecasting model.")
+parser.add_argument("--plots", action="store_true",
+                    help=f"also render the 4 diagnostic PNGs into {PLOTS_DIR}")
+args = parser.parse_args()
 
 # ============================================================
 # 1️⃣  LOAD DATA
@@ -38,31 +58,81 @@ print(f"   Rows: {len(df):,}   Cols: {df.shape[1]}")
 df["Timestamp"] = pd.to_datetime(df["Timestamp"])
 df = df.sort_values("Timestamp").reset_index(drop=True)
 
+# Typed, sorted columnar copy for serve_model.py — skips CSV parsing and
+# pd.to_datetime on every service start
+try:
+    df.to_parquet(PARQUET_PATH, index=False)
+    print(f"   Parquet copy → {PARQUET_PATH}")
+except ImportError:
+    print("   (pyarrow not installed — skipping Parquet copy)")
+
 # ============================================================
 # 2️⃣  FEATURE ENGINEERING
 # ============================================================
 print("⚙️  Engineering features...")
 
-# Time features
-df["hour"]      = df["Timestamp"].dt.hour
-df["dayofweek"] = df["Timestamp"].dt.dayofweek
-df["month"]     = df["Timestamp"].dt.month
-df["is_weekend"] = df["dayofweek"].isin([5, 6]).astype(int)
+# Time features — one datetime64 extraction, plain integer arithmetic after
+ts_h = df["Timestamp"].to_numpy().astype("datetime64[h]")
+days = ts_h.astype("datetime64[D]").astype(np.int64)
+dow  = (days + 3) % 7                        # 1970-01-01 was a Thursday
+df["hour"]       = ts_h.astype(np.int64) % 24
+df["dayofweek"]  = dow
+df["month"]      = ts_h.astype("datetime64[M]").astype(np.int64) % 12 + 1
+df["is_weekend"] = (dow >= 5).astype(np.int8)
+
+pc = df["Power Consumption (kW)"].to_numpy(dtype=np.float64)
 
 # Lag features (next 15-min forecast → shift by 1 interval = 15 min)
-df["power_lag_1"] = df["Power Consumption (kW)"].shift(1)
-df["power_lag_2"] = df["Power Consumption (kW)"].shift(2)
-df["power_lag_4"] = df["Power Consumption (kW)"].shift(4)   # 1-hour lag
+def lag(arr, k):
+    return np.concatenate([np.full(k, np.nan), arr[:-k]])
+
+df["power_lag_1"] = lag(pc, 1)
+df["power_lag_2"] = lag(pc, 2)
+df["power_lag_4"] = lag(pc, 4)   # 1-hour lag
 
 # Rolling features (1 hour = 4 × 15-min intervals)
-df["power_roll_mean_1h"] = df["Power Consumption (kW)"].rolling(window=4).mean()
-df["power_roll_std_1h"]  = df["Power Consumption (kW)"].rolling(window=4).std()
-df["power_roll_max_1h"]  = df["Power Consumption (kW)"].rolling(window=4).max()
+if numba is not None and np.isfinite(pc).all():
+    # Fused kernel: one streaming pass writes mean, std and max together
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def roll4(pc, m, s, mx):
+        for i in numba.prange(3, pc.shape[0]):
+            a, b, c, d = pc[i-3], pc[i-2], pc[i-1], pc[i]
+            mean = (a + b + c + d) * 0.25
+            m[i]  = mean
+            mx[i] = max(max(a, b), max(c, d))
+            var = ((a-mean)**2 + (b-mean)**2 + (c-mean)**2 + (d-mean)**2) / 3
+            s[i]  = math.sqrt(var)
+
+    roll_mean, roll_std, roll_max = (np.full(len(pc), np.nan) for _ in range(3))
+    roll4(pc, roll_mean, roll_std, roll_max)
+else:
+    # One (N-3, 4) strided view, reduced three ways — no copies of the column
+    win = np.lib.stride_tricks.sliding_window_view(pc, 4)
+    pad = np.full(3, np.nan)
+    roll_mean = np.concatenate([pad, win.mean(axis=1)])
+    roll_std  = np.concatenate([pad, win.std(axis=1, ddof=1)])
+    roll_max  = np.concatenate([pad, win.max(axis=1)])
+
+df["power_roll_mean_1h"] = roll_mean
+df["power_roll_std_1h"]  = roll_std
+df["power_roll_max_1h"]  = roll_max
 
 # Drop NaN rows introduced by shift/rolling
 df.dropna(inplace=True)
 print(f"   Rows after dropna: {len(df):,}")
 
+# Downcast: calendar columns fit in int8, and XGBoost scores in float32
+# anyway — halves the bytes every later aggregation has to stream
+INT8_COLS    = ["hour", "dayofweek", "month", "is_weekend"]
+FLOAT32_COLS = [
+    "power_lag_1", "power_lag_2", "power_lag_4",
+    "power_roll_mean_1h", "power_roll_std_1h", "power_roll_max_1h",
+    "Power Consumption (kW)", "Voltage (V)", "Current (A)",
+    "Reactive Power (kVAR)", "Power Factor",
+]
+df[INT8_COLS]    = df[INT8_COLS].astype(np.int8)
+df[FLOAT32_COLS] = df[FLOAT32_COLS].astype(np.float32)
+
 # ============================================================
 # 3️⃣  LOAD FORECASTING (Next 15 Minutes)
 # ============================================================
@@ -106,6 +176,9 @@ model = XGBRegressor(
     colsample_bytree=0.8,
     random_state=42,
     n_jobs=-1,
+    tree_method="hist",         # quantised split search — much faster fit
+    max_bin=128,
+    grow_policy="lossguide",
 )
 model.fit(
     X_train, y_train,
@@ -132,9 +205,21 @@ print("=================================================")
 # ============================================================
 # 6️⃣  SAVE MODEL
 # ============================================================
-joblib.dump(model, MODEL_PATH)
+# Native JSON: serve_model loads it straight into an xgb.Booster, skipping
+# the pickled sklearn wrapper
+model.get_booster().save_model(MODEL_PATH)
 print(f"\n💾 Model saved → {MODEL_PATH}")
 
+# Compiled tree ensemble: the low-latency scoring path in serve_model
+if treelite is not None:
+    try:
+        tl_model = treelite.frontend.from_xgboost(model.get_booster())
+        tl2cgen.export_lib(tl_model, toolchain="gcc", libpath=COMPILED_MODEL_PATH,
+                           params={"parallel_comp": 8}, verbose=False)
+        print(f"💾 Compiled model → {COMPILED_MODEL_PATH}")
+    except Exception as e:
+        print(f"   (Treelite compile skipped: {e})")
+
 # ============================================================
 # 7️⃣  EFFICIENCY ANALYSIS
 # ============================================================
@@ -171,69 +256,77 @@ print("\n=========== FEATURE IMPORTANCE ===========")
 print(feat_imp.to_string())
 
 # ============================================================
-# 🔟  VISUALIZATIONS  (saved as PNG files)
-# ============================================================
-print("\n📈 Generating plots …")
-
-# --- Plot 1: Actual vs Predicted (first 300 points) ----------
-N = 300
-plt.figure(figsize=(14, 5))
-plt.plot(y_test.values[:N], label="Actual",    color="#22c55e", linewidth=1.5)
-plt.plot(y_pred[:N],        label="Predicted", color="#8b5cf6",
-         linewidth=1.5, linestyle="--", alpha=0.85)
-plt.title("Load Forecasting — Actual vs Predicted (Next 15 min)", fontsize=14)
-plt.xlabel("Time Interval (×15 min)")
-plt.ylabel("Power Consumption (kW)")
-plt.legend()
-plt.tight_layout()
-p1 = os.path.join(PLOTS_DIR, "01_actual_vs_predicted.png")
-plt.savefig(p1, dpi=150)
-plt.close()
-print(f"   Saved → {p1}")
-
-# --- Plot 2: Feature Importance -------------------------------
-plt.figure(figsize=(10, 6))
-feat_imp.plot(kind="barh", color="#3b82f6")
-plt.title("XGBoost Feature Importance", fontsize=14)
-plt.xlabel("Importance Score")
-plt.gca().invert_yaxis()
-plt.tight_layout()
-p2 = os.path.join(PLOTS_DIR, "02_feature_importance.png")
-plt.savefig(p2, dpi=150)
-plt.close()
-print(f"   Saved → {p2}")
-
-# --- Plot 3: Daily Peak Load ----------------------------------
-plt.figure(figsize=(14, 4))
-daily_peak.plot(color="#f97316", linewidth=1.5, marker="o", markersize=3)
-plt.title("Daily Peak Load (kW)", fontsize=14)
-plt.xlabel("Date")
-plt.ylabel("Peak Power (kW)")
-plt.grid(alpha=0.3)
-plt.tight_layout()
-p3 = os.path.join(PLOTS_DIR, "03_daily_peak_load.png")
-plt.savefig(p3, dpi=150)
-plt.close()
-print(f"   Saved → {p3}")
-
-# --- Plot 4: Power Factor Distribution -----------------------
-plt.figure(figsize=(10, 4))
-df["Power Factor"].hist(bins=60, color="#8b5cf6", edgecolor="none", alpha=0.8)
-plt.axvline(LOW_PF_THRESHOLD, color="red", linestyle="--",
-            linewidth=1.5, label=f"Threshold ({LOW_PF_THRESHOLD})")
-plt.axvline(df["Power Factor"].mean(), color="#22c55e", linestyle="-",
-            linewidth=1.5, label=f"Mean ({df['Power Factor'].mean():.3f})")
-plt.title("Power Factor Distribution", fontsize=14)
-plt.xlabel("Power Factor")
-plt.ylabel("Count")
-plt.legend()
-plt.tight_layout()
-p4 = os.path.join(PLOTS_DIR, "04_power_factor_distribution.png")
-plt.savefig(p4, dpi=150)
-plt.close()
-print(f"   Saved → {p4}")
+# 🔟  VISUALIZATIONS  (saved as PNG files, only with --plots)
+# ============================================================
+if args.plots:
+    import matplotlib
+    matplotlib.use("Agg")           # headless — saves to file, no GUI needed
+    import matplotlib.pyplot as plt
+
+    os.makedirs(PLOTS_DIR, exist_ok=True)
+    print("\n📈 Generating plots …")
+
+    # --- Plot 1: Actual vs Predicted (first 300 points) ----------
+    N = 300
+    fig, ax = plt.subplots(figsize=(14, 5))
+    ax.plot(y_test.values[:N], label="Actual",    color="#22c55e", linewidth=1.5,
+            rasterized=True)
+    ax.plot(y_pred[:N],        label="Predicted", color="#8b5cf6",
+            linewidth=1.5, linestyle="--", alpha=0.85, rasterized=True)
+    ax.set_title("Load Forecasting — Actual vs Predicted (Next 15 min)", fontsize=14)
+    ax.set_xlabel("Time Interval (×15 min)")
+    ax.set_ylabel("Power Consumption (kW)")
+    ax.legend()
+    fig.tight_layout()
+    p1 = os.path.join(PLOTS_DIR, "01_actual_vs_predicted.png")
+    fig.savefig(p1, dpi=100)
+    plt.close(fig)
+    print(f"   Saved → {p1}")
+
+    # --- Plot 2: Feature Importance -------------------------------
+    fig, ax = plt.subplots(figsize=(10, 6))
+    feat_imp.plot(kind="barh", color="#3b82f6", ax=ax)
+    ax.set_title("XGBoost Feature Importance", fontsize=14)
+    ax.set_xlabel("Importance Score")
+    ax.invert_yaxis()
+    fig.tight_layout()
+    p2 = os.path.join(PLOTS_DIR, "02_feature_importance.png")
+    fig.savefig(p2, dpi=100)
+    plt.close(fig)
+    print(f"   Saved → {p2}")
+
+    # --- Plot 3: Daily Peak Load ----------------------------------
+    fig, ax = plt.subplots(figsize=(14, 4))
+    daily_peak.plot(color="#f97316", linewidth=1.5, marker=None, ax=ax)
+    ax.set_title("Daily Peak Load (kW)", fontsize=14)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Peak Power (kW)")
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+    p3 = os.path.join(PLOTS_DIR, "03_daily_peak_load.png")
+    fig.savefig(p3, dpi=100)
+    plt.close(fig)
+    print(f"   Saved → {p3}")
+
+    # --- Plot 4: Power Factor Distribution -----------------------
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.hist(df["Power Factor"], bins=60, color="#8b5cf6", edgecolor="none", alpha=0.8)
+    ax.axvline(LOW_PF_THRESHOLD, color="red", linestyle="--",
+               linewidth=1.5, label=f"Threshold ({LOW_PF_THRESHOLD})")
+    ax.axvline(df["Power Factor"].mean(), color="#22c55e", linestyle="-",
+               linewidth=1.5, label=f"Mean ({df['Power Factor'].mean():.3f})")
+    ax.set_title("Power Factor Distribution", fontsize=14)
+    ax.set_xlabel("Power Factor")
+    ax.set_ylabel("Count")
+    ax.legend()
+    fig.tight_layout()
+    p4 = os.path.join(PLOTS_DIR, "04_power_factor_distribution.png")
+    fig.savefig(p4, dpi=100)
+    plt.close(fig)
+    print(f"   Saved → {p4}")
 
 print("\n✅ System Execution Complete")
 print(f"   Model  : {MODEL_PATH}")
-print(f"   Plots  : {PLOTS_DIR}/")
+if args.plots:
+    print(f"   Plots  : {PLOTS_DIR}/")
 print(f"   MAE={mae_val:.4f} kW  |  RMSE={rmse_val:.4f} kW  |  R²={r2_val:.4f}")